@@ -32,7 +32,7 @@ def test_anonymous():
     print(f"testing connection to {BROKER_HOST}:{BROKER_PORT}")
     userdata = {'connected': False, 'error_code': None}
 
-    client = mqtt.Client(client_id=f"connectivity_test_{os.getpid()}")
+    client = mqtt.Client(mqtt.CallbackAPIVersion.VERSION1, client_id=f"connectivity_test_{os.getpid()}")
     client.user_data_set(userdata)
     client.on_connect = on_connect
 
@@ -71,7 +71,7 @@ def test_with_credentials(username, password):
     print(f"testing with credentials: {username}")
     userdata = {'connected': False, 'error_code': None}
 
-    client = mqtt.Client(client_id=f"connectivity_test_auth_{os.getpid()}")
+    client = mqtt.Client(mqtt.CallbackAPIVersion.VERSION1, client_id=f"connectivity_test_auth_{os.getpid()}")
     client.user_data_set(userdata)
     client.username_pw_set(username, password)
     client.on_connect = on_connect
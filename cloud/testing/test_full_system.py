@@ -13,6 +13,17 @@ TEST_TOPIC = "test/system_check"
 messages_received = []
 publisher_connected = False
 subscriber_connected = False
+subscriber_ready = False
+
+
+def wait_for(condition, timeout, interval=0.05):
+    # poll instead of sleeping a fixed time, returns as soon as the condition holds
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(interval)
+    return True
 
 
 def on_sub_connect(client, userdata, flags, rc):
@@ -25,6 +36,11 @@ def on_sub_connect(client, userdata, flags, rc):
         print(f"subscriber failed: {rc}")
 
 
+def on_sub_subscribe(client, userdata, mid, granted_qos):
+    global subscriber_ready
+    subscriber_ready = True
+
+
 def on_sub_message(client, userdata, msg):
     try:
         payload = json.loads(msg.payload.decode())
@@ -47,27 +63,27 @@ def test_system():
     print(f"full system test - {BROKER_HOST}:{BROKER_PORT}")
     print(f"topic: {TEST_TOPIC}")
 
-    subscriber = mqtt.Client(client_id=f"test_sub_{os.getpid()}")
+    subscriber = mqtt.Client(mqtt.CallbackAPIVersion.VERSION1, client_id=f"test_sub_{os.getpid()}")
     subscriber.on_connect = on_sub_connect
+    subscriber.on_subscribe = on_sub_subscribe
     subscriber.on_message = on_sub_message
 
-    publisher = mqtt.Client(client_id=f"test_pub_{os.getpid()}")
+    publisher = mqtt.Client(mqtt.CallbackAPIVersion.VERSION1, client_id=f"test_pub_{os.getpid()}")
     publisher.on_connect = on_pub_connect
 
     try:
         subscriber.connect(BROKER_HOST, BROKER_PORT, 60)
         subscriber.loop_start()
-        time.sleep(2)
 
-        if not subscriber_connected:
+        # wait for the SUBACK too, otherwise the first publishes can beat the subscription
+        if not wait_for(lambda: subscriber_ready, 5):
             print("subscriber timeout")
             return False
 
         publisher.connect(BROKER_HOST, BROKER_PORT, 60)
         publisher.loop_start()
-        time.sleep(2)
 
-        if not publisher_connected:
+        if not wait_for(lambda: publisher_connected, 5):
             print("publisher timeout")
             return False
 
@@ -80,9 +96,8 @@ def test_system():
         print("publishing test messages...")
         for data in test_data:
             publisher.publish(TEST_TOPIC, json.dumps(data), qos=1)
-            time.sleep(0.5)
 
-        time.sleep(3)
+        wait_for(lambda: len(messages_received) >= len(test_data), 5)
 
         print(f"published: {len(test_data)}, received: {len(messages_received)}")
 
@@ -62,7 +62,7 @@ def main():
     print(f"topic: {TOPIC}, interval: {INTERVAL}s")
 
     userdata = {'connected': False, 'count': 0}
-    client = mqtt.Client(client_id=f"test_publisher_{os.getpid()}")
+    client = mqtt.Client(mqtt.CallbackAPIVersion.VERSION1, client_id=f"test_publisher_{os.getpid()}")
     client.user_data_set(userdata)
     client.on_connect = on_connect
     client.on_publish = on_publish
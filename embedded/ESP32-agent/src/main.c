@@ -15,38 +15,32 @@
 #include "mqtt.h"
 #include "cJSON.h"
 
-#define UART_LINK       UART_NUM_2
-#define LINK_TX_PIN     GPIO_NUM_17
-#define LINK_RX_PIN     GPIO_NUM_16
-#define BAUD_RATE       115200
-#define RX_BUF_SIZE     1024
+#define UART_LINK           UART_NUM_2
+#define LINK_TX_PIN         GPIO_NUM_17
+#define LINK_RX_PIN         GPIO_NUM_16
+#define BAUD_RATE           115200
+#define RX_BUF_SIZE         1024
+#define RX_CHUNK_SIZE       256
+#define RX_LOG_INTERVAL_MS  1000
 
 static const char *TAG = "agent";
 
-static const char *state_str(uint8_t s)
-{
-    switch (s) {
-    case 0:  return "NORMAL";
-    case 1:  return "WARNING";
-    case 2:  return "SCRAM";
-    default: return "UNKNOWN";
-    }
-}
-
 static void send_command(uint8_t cmd_id, const uint8_t *extra, uint8_t extra_len)
 {
-    uint8_t payload[1 + extra_len];
-    payload[0] = cmd_id;
-    if (extra && extra_len > 0) {
-        memcpy(&payload[1], extra, extra_len);
+    if (extra_len > MAX_PAYLOAD_LEN - 1 || (extra_len > 0 && !extra)) {
+        return;
     }
 
-    uint8_t header[3] = { FRAME_START_BYTE, MSG_TYPE_COMMAND, (uint8_t)(1 + extra_len) };
-    uint8_t checksum = protocol_calc_checksum(MSG_TYPE_COMMAND, 1 + extra_len, payload);
+    // the command is written straight into the frame, there is no separate payload copy
+    uint8_t frame[MAX_PAYLOAD_LEN + FRAME_OVERHEAD];
+    uint8_t *payload = &frame[FRAME_HEADER_LEN];
+    payload[CMD_OFF_ID] = cmd_id;
+    if (extra_len > 0) {
+        memcpy(&payload[CMD_OFF_VALUE], extra, extra_len);
+    }
 
-    uart_write_bytes(UART_LINK, (const char *)header, 3);
-    uart_write_bytes(UART_LINK, (const char *)payload, 1 + extra_len);
-    uart_write_bytes(UART_LINK, (const char *)&checksum, 1);
+    size_t n = protocol_finish_frame(frame, MSG_TYPE_COMMAND, (uint8_t)(1 + extra_len));
+    uart_write_bytes(UART_LINK, (const char *)frame, n);
 }
 
 static void send_scram(void)
@@ -106,27 +100,23 @@ static void handle_telemetry(const uint8_t *payload, uint8_t len)
         return;
     }
 
-    uint32_t sample_id;
-    float temp_c, accel_mag;
-    uint8_t state, power;
-
-    memcpy(&sample_id, payload, sizeof(sample_id));
-    memcpy(&temp_c, payload + 4, sizeof(temp_c));
-    memcpy(&accel_mag, payload + 8, sizeof(accel_mag));
-    state = payload[12];
-    power = payload[13];
-
-    mqtt_telemetry_t t = {
-        .sample_id = sample_id,
-        .temp_c = temp_c,
-        .accel_mag = accel_mag,
-        .state = state,
-        .power = power,
-    };
+    // decode straight into the record handed to the mqtt task
+    mqtt_telemetry_t t;
+    memcpy(&t.sample_id, &payload[TELEMETRY_OFF_SAMPLE_ID], sizeof(t.sample_id));
+    memcpy(&t.temp_c, &payload[TELEMETRY_OFF_TEMP], sizeof(t.temp_c));
+    memcpy(&t.accel_mag, &payload[TELEMETRY_OFF_ACCEL], sizeof(t.accel_mag));
+    t.state = payload[TELEMETRY_OFF_STATE];
+    t.power = payload[TELEMETRY_OFF_POWER];
     mqtt_update_telemetry(&t);
 
-    ESP_LOGI(TAG, "rx: id=%" PRIu32 " temp=%.1fC accel=%.2fg state=%s power=%u%%",
-             sample_id, temp_c, accel_mag, state_str(state), (unsigned)power);
+    // frames arrive at 10hz, formatting and printing every one stalls the rx task
+    static TickType_t last_log = 0;
+    TickType_t now = xTaskGetTickCount();
+    if (now - last_log >= pdMS_TO_TICKS(RX_LOG_INTERVAL_MS)) {
+        last_log = now;
+        ESP_LOGI(TAG, "rx: id=%" PRIu32 " temp=%.1fC accel=%.2fg state=%s power=%u%%",
+                 t.sample_id, t.temp_c, t.accel_mag, protocol_state_str(t.state), (unsigned)t.power);
+    }
 }
 
 // callback invoked by frame parser when a valid frame arrives
@@ -170,13 +160,21 @@ static void uart_rx_task(void *arg)
     frame_parser_t parser;
     frame_parser_init(&parser, on_frame, NULL);
 
-    uint8_t buf[128];
+    uint8_t buf[RX_CHUNK_SIZE];
     for (;;) {
-        int n = uart_read_bytes(UART_LINK, buf, sizeof(buf), pdMS_TO_TICKS(50));
+        // drain everything already buffered, or block until the next byte arrives
+        size_t want = 0;
+        uart_get_buffered_data_len(UART_LINK, &want);
+        if (want == 0) {
+            want = 1;
+        } else if (want > sizeof(buf)) {
+            want = sizeof(buf);
+        }
+
+        int n = uart_read_bytes(UART_LINK, buf, want, pdMS_TO_TICKS(500));
         if (n > 0) {
             frame_parser_feed(&parser, buf, (size_t)n);
         }
-        vTaskDelay(pdMS_TO_TICKS(1));
     }
 }
 
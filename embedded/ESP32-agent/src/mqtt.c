@@ -22,16 +22,6 @@ static QueueHandle_t s_telemetry_queue = NULL;
 static mqtt_command_callback_t s_cmd_callback = NULL;
 static char s_cmd_topic[64] = {0};
 
-static const char *state_str(uint8_t s)
-{
-    switch (s) {
-    case 0:  return "NORMAL";
-    case 1:  return "WARNING";
-    case 2:  return "SCRAM";
-    default: return "UNKNOWN";
-    }
-}
-
 static void build_client_id(char *out, size_t len, const char *base)
 {
     uint8_t mac[6];
@@ -156,12 +146,12 @@ static void mqtt_task(void *arg)
         snprintf(json, sizeof(json),
                  "{\"sample_id\":%lu,\"temp\":%.2f,\"accel_mag\":%.3f,\"state\":\"%s\",\"power\":%u}",
                  (unsigned long)t.sample_id, t.temp_c, t.accel_mag,
-                 state_str(t.state), (unsigned)t.power);
+                 protocol_state_str(t.state), (unsigned)t.power);
 
         int msg_id = esp_mqtt_client_publish(s_client, params->pub_topic, json, 0, 1, 0);
         if (msg_id >= 0) {
             ESP_LOGI(TAG, "pub: id=%lu temp=%.1f state=%s",
-                     (unsigned long)t.sample_id, t.temp_c, state_str(t.state));
+                     (unsigned long)t.sample_id, t.temp_c, protocol_state_str(t.state));
         }
 
         last_sample_id = t.sample_id;
@@ -20,14 +20,13 @@ void comms_set_command_queue(QueueHandle_t queue)
 // sends a framed message over uart
 static void send_frame(uint8_t msg_type, const uint8_t *payload, uint8_t len)
 {
-    uint8_t header[3] = { FRAME_START_BYTE, msg_type, len };
-    uint8_t checksum = protocol_calc_checksum(msg_type, len, payload);
-
-    uart_write_bytes(COMMS_UART_NUM, (const char *)header, 3);
-    if (len > 0 && payload) {
-        uart_write_bytes(COMMS_UART_NUM, (const char *)payload, len);
+    if (len > MAX_PAYLOAD_LEN || (len > 0 && !payload)) {
+        return;
     }
-    uart_write_bytes(COMMS_UART_NUM, (const char *)&checksum, 1);
+
+    uint8_t frame[MAX_PAYLOAD_LEN + FRAME_OVERHEAD];
+    size_t n = protocol_build_frame(frame, msg_type, payload, len);
+    uart_write_bytes(COMMS_UART_NUM, (const char *)frame, n);
 }
 
 void comms_send_telemetry(const reactor_telemetry_t *t)
@@ -35,16 +34,12 @@ void comms_send_telemetry(const reactor_telemetry_t *t)
     if (!t) return;
 
     uint8_t payload[TELEMETRY_PAYLOAD_LEN];
-    uint8_t *p = payload;
 
-    memcpy(p, &t->sample_id, sizeof(uint32_t));
-    p += sizeof(uint32_t);
-    memcpy(p, &t->temperature_c, sizeof(float));
-    p += sizeof(float);
-    memcpy(p, &t->accel_mag, sizeof(float));
-    p += sizeof(float);
-    *p++ = (uint8_t)t->state;
-    *p++ = t->power_percent;
+    memcpy(&payload[TELEMETRY_OFF_SAMPLE_ID], &t->sample_id, sizeof(uint32_t));
+    memcpy(&payload[TELEMETRY_OFF_TEMP], &t->temperature_c, sizeof(float));
+    memcpy(&payload[TELEMETRY_OFF_ACCEL], &t->accel_mag, sizeof(float));
+    payload[TELEMETRY_OFF_STATE] = (uint8_t)t->state;
+    payload[TELEMETRY_OFF_POWER] = t->power_percent;
 
     send_frame(MSG_TYPE_TELEMETRY, payload, TELEMETRY_PAYLOAD_LEN);
 }
@@ -63,7 +58,7 @@ static void on_frame(void *ctx, uint8_t msg_type, const uint8_t *payload, uint8_
         return;
     }
 
-    uint8_t cmd_id = payload[0];
+    uint8_t cmd_id = payload[CMD_OFF_ID];
     reactor_command_t cmd = {0};
 
     switch (cmd_id) {
@@ -76,11 +71,11 @@ static void on_frame(void *ctx, uint8_t msg_type, const uint8_t *payload, uint8_
         break;
 
     case CMD_ID_SET_POWER:
-        if (len < 5) {
+        if (len < CMD_SET_POWER_LEN) {
             ESP_LOGW(TAG, "SET_POWER frame too short");
             return;
         }
-        memcpy(&cmd.value, &payload[1], sizeof(int32_t));
+        memcpy(&cmd.value, &payload[CMD_OFF_VALUE], sizeof(int32_t));
         cmd.type = CMD_SET_POWER;
         break;
 
@@ -1,5 +1,7 @@
 #include "frame_parser.h"
 
+#include <string.h>
+
 void frame_parser_init(frame_parser_t *parser, frame_callback_t callback, void *ctx)
 {
     parser->state = FP_WAIT_START;
@@ -21,8 +23,27 @@ void frame_parser_reset(frame_parser_t *parser)
 
 void frame_parser_feed(frame_parser_t *parser, const uint8_t *data, size_t len)
 {
-    for (size_t i = 0; i < len; i++) {
-        uint8_t b = data[i];
+    size_t i = 0;
+    while (i < len) {
+        // payload bytes arrive contiguously, so take as many as this chunk has
+        if (parser->state == FP_READ_PAYLOAD) {
+            size_t n = parser->len - parser->idx;
+            if (n > len - i) {
+                n = len - i;
+            }
+            memcpy(&parser->payload[parser->idx], &data[i], n);
+            for (size_t k = 0; k < n; k++) {
+                parser->checksum ^= data[i + k];
+            }
+            parser->idx += (uint8_t)n;
+            i += n;
+            if (parser->idx >= parser->len) {
+                parser->state = FP_READ_CHECKSUM;
+            }
+            continue;
+        }
+
+        uint8_t b = data[i++];
 
         switch (parser->state) {
         case FP_WAIT_START:
@@ -50,14 +71,6 @@ void frame_parser_feed(frame_parser_t *parser, const uint8_t *data, size_t len)
             }
             break;
 
-        case FP_READ_PAYLOAD:
-            parser->payload[parser->idx++] = b;
-            parser->checksum ^= b;
-            if (parser->idx >= parser->len) {
-                parser->state = FP_READ_CHECKSUM;
-            }
-            break;
-
         case FP_READ_CHECKSUM:
             if (parser->checksum == b && parser->callback) {
                 parser->callback(parser->callback_ctx, parser->msg_type,
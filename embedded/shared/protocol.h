@@ -1,10 +1,14 @@
 #pragma once
 
 #include <stdint.h>
+#include <stddef.h>
+#include <string.h>
 
 // frame format: [START] [TYPE] [LEN] [PAYLOAD...] [CHECKSUM]
 #define FRAME_START_BYTE    0xAA
 #define MAX_PAYLOAD_LEN     64
+#define FRAME_OVERHEAD      4
+#define FRAME_HEADER_LEN    3
 
 // message types
 #define MSG_TYPE_TELEMETRY  0x01
@@ -15,14 +19,61 @@
 #define CMD_ID_RESET_NORMAL 2
 #define CMD_ID_SET_POWER    3
 
+// command payload: u8 cmd_id, then i32 value for SET_POWER
+#define CMD_OFF_ID              0
+#define CMD_OFF_VALUE           1
+#define CMD_SET_POWER_LEN       5
+
 // telemetry payload: u32 sample_id, f32 temp, f32 accel, u8 state, u8 power
-#define TELEMETRY_PAYLOAD_LEN 14
+#define TELEMETRY_PAYLOAD_LEN   14
+#define TELEMETRY_OFF_SAMPLE_ID 0
+#define TELEMETRY_OFF_TEMP      4
+#define TELEMETRY_OFF_ACCEL     8
+#define TELEMETRY_OFF_STATE     12
+#define TELEMETRY_OFF_POWER     13
+
+static inline const char *protocol_state_str(uint8_t state)
+{
+    static const char *const names[] = { "NORMAL", "WARNING", "SCRAM" };
+    return state < sizeof(names) / sizeof(names[0]) ? names[state] : "UNKNOWN";
+}
 
 static inline uint8_t protocol_calc_checksum(uint8_t msg_type, uint8_t len, const uint8_t *payload)
 {
-    uint8_t c = msg_type ^ len;
-    for (uint8_t i = 0; i < len; i++) {
+    // xor four bytes at a time, then fold the word down to one byte
+    uint32_t acc = 0;
+    size_t i = 0;
+    for (; i + sizeof(acc) <= len; i += sizeof(acc)) {
+        uint32_t w;
+        memcpy(&w, &payload[i], sizeof(w));
+        acc ^= w;
+    }
+    acc ^= acc >> 16;
+    acc ^= acc >> 8;
+
+    uint8_t c = msg_type ^ len ^ (uint8_t)acc;
+    for (; i < len; i++) {
         c ^= payload[i];
     }
     return c;
 }
+
+// for a payload already written at out[FRAME_HEADER_LEN], fills in the header and checksum
+static inline size_t protocol_finish_frame(uint8_t *out, uint8_t msg_type, uint8_t len)
+{
+    out[0] = FRAME_START_BYTE;
+    out[1] = msg_type;
+    out[2] = len;
+    out[FRAME_HEADER_LEN + len] = protocol_calc_checksum(msg_type, len, &out[FRAME_HEADER_LEN]);
+    return (size_t)len + FRAME_OVERHEAD;
+}
+
+// writes a whole frame into out, which must hold len + FRAME_OVERHEAD bytes
+static inline size_t protocol_build_frame(uint8_t *out, uint8_t msg_type,
+                                          const uint8_t *payload, uint8_t len)
+{
+    if (len > 0) {
+        memcpy(&out[FRAME_HEADER_LEN], payload, len);
+    }
+    return protocol_finish_frame(out, msg_type, len);
+}